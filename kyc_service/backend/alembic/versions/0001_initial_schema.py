@@ -0,0 +1,99 @@
+"""initial schema
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-19 12:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('email', sa.String(), nullable=False),
+        sa.Column('hashed_password', sa.String(), nullable=False),
+        sa.Column('user_type', sa.String(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('is_verified', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+
+    op.create_table(
+        'investors',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('first_name', sa.String(), nullable=False),
+        sa.Column('last_name', sa.String(), nullable=False),
+        sa.Column('date_of_birth', sa.Date(), nullable=False),
+        sa.Column('phone_number', sa.String(), nullable=False),
+        sa.Column('id_document_type', sa.String(), nullable=False),
+        sa.Column('id_document_number', sa.String(), nullable=False),
+        sa.Column('id_document_front', sa.LargeBinary(), nullable=True),
+        sa.Column('id_document_back', sa.LargeBinary(), nullable=True),
+        sa.Column('selfie_with_id', sa.LargeBinary(), nullable=True),
+        sa.Column('address', sa.Text(), nullable=False),
+        sa.Column('tax_number', sa.String(), nullable=True),
+        sa.Column('risk_level', sa.String(), nullable=True),
+        sa.Column('verification_status', sa.String(), nullable=True),
+        sa.Column('rejection_reason', sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_investors_id'), 'investors', ['id'], unique=False)
+
+    op.create_table(
+        'businesses',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('company_name', sa.String(), nullable=False),
+        sa.Column('registration_number', sa.String(), nullable=False),
+        sa.Column('registration_date', sa.Date(), nullable=False),
+        sa.Column('tax_number', sa.String(), nullable=False),
+        sa.Column('legal_address', sa.Text(), nullable=False),
+        sa.Column('physical_address', sa.Text(), nullable=False),
+        sa.Column('business_type', sa.String(), nullable=False),
+        sa.Column('industry', sa.String(), nullable=False),
+        sa.Column('director_first_name', sa.String(), nullable=False),
+        sa.Column('director_last_name', sa.String(), nullable=False),
+        sa.Column('director_dob', sa.Date(), nullable=False),
+        sa.Column('director_id_number', sa.String(), nullable=False),
+        sa.Column('director_id_document', sa.LargeBinary(), nullable=True),
+        sa.Column('director_selfie', sa.LargeBinary(), nullable=True),
+        sa.Column('company_registration_certificate', sa.LargeBinary(), nullable=True),
+        sa.Column('tax_registration_certificate', sa.LargeBinary(), nullable=True),
+        sa.Column('ownership_structure', sa.Text(), nullable=True),
+        sa.Column('website', sa.String(), nullable=True),
+        sa.Column('phone_number', sa.String(), nullable=False),
+        sa.Column('email', sa.String(), nullable=False),
+        sa.Column('verification_status', sa.String(), nullable=True),
+        sa.Column('rejection_reason', sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_businesses_id'), 'businesses', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_businesses_id'), table_name='businesses')
+    op.drop_table('businesses')
+    op.drop_index(op.f('ix_investors_id'), table_name='investors')
+    op.drop_table('investors')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_table('users')
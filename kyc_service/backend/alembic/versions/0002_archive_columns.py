@@ -0,0 +1,31 @@
+"""archive columns on investors and businesses
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 12:10:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    for table in ('investors', 'businesses'):
+        op.add_column(table, sa.Column('finalized_at', sa.DateTime(), nullable=True))
+        op.add_column(table, sa.Column('documents_archive_pointer', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    for table in ('investors', 'businesses'):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('documents_archive_pointer')
+            batch_op.drop_column('finalized_at')
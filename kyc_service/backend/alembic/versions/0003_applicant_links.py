@@ -0,0 +1,38 @@
+"""applicant linkage index
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 12:20:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'applicant_links',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('key_type', sa.String(), nullable=False),
+        sa.Column('key_value', sa.String(), nullable=False),
+        sa.Column('applicant_type', sa.String(), nullable=False),
+        sa.Column('applicant_id', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_applicant_links_key', 'applicant_links', ['key_type', 'key_value'], unique=False)
+    op.create_index('ix_applicant_links_applicant', 'applicant_links', ['applicant_type', 'applicant_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_applicant_links_applicant', table_name='applicant_links')
+    op.drop_index('ix_applicant_links_key', table_name='applicant_links')
+    op.drop_table('applicant_links')
@@ -0,0 +1,312 @@
+"""Archival of documents for finalized applicants.
+
+Documents of approved/rejected investors and businesses are packed into
+compressed, append-only segment files under ``settings.ARCHIVE_DIR`` and the
+``LargeBinary`` columns are cleared, leaving ``documents_archive_pointer``
+behind so the documents can still be retrieved.
+
+Run from the backend directory:
+    python -m app.archive archive   # move documents older than ARCHIVE_MIN_AGE_DAYS
+    python -m app.archive purge     # drop segments older than ARCHIVE_RETENTION_DAYS
+"""
+import fcntl
+import json
+import logging
+import os
+import struct
+import sys
+import zlib
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from . import models
+from .config import settings
+
+
+logger = logging.getLogger(__name__)
+
+FINALIZED_STATUSES = ("approved", "rejected")
+
+DOCUMENT_COLUMNS = {
+    models.Investor: ("id_document_front", "id_document_back", "selfie_with_id"),
+    models.Business: (
+        "director_id_document",
+        "director_selfie",
+        "company_registration_certificate",
+        "tax_registration_certificate",
+    ),
+}
+
+_HEADER_LENGTH = struct.Struct(">I")
+INDEX_FILENAME = "index.jsonl"
+LOCK_FILENAME = ".lock"
+COUNTER_FILENAME = "segment.counter"
+
+
+def _pack(documents: Dict[str, Optional[bytes]]) -> bytes:
+    header = json.dumps({name: (None if data is None else len(data)) for name, data in documents.items()})
+    header_bytes = header.encode("utf-8")
+    body = b"".join(data for data in documents.values() if data is not None)
+    return zlib.compress(_HEADER_LENGTH.pack(len(header_bytes)) + header_bytes + body)
+
+
+def _unpack(record: bytes) -> Dict[str, Optional[bytes]]:
+    raw = zlib.decompress(record)
+    (header_length,) = _HEADER_LENGTH.unpack_from(raw)
+    offset = _HEADER_LENGTH.size
+    header = json.loads(raw[offset:offset + header_length])
+    offset += header_length
+    documents = {}
+    for name, length in header.items():
+        if length is None:
+            documents[name] = None
+            continue
+        documents[name] = raw[offset:offset + length]
+        offset += length
+    return documents
+
+
+class SegmentArchive:
+    """Append-only segment files with a JSON-lines index.
+
+    Pointers have the form ``<segment>:<offset>:<length>`` and can be read
+    without consulting the index; the index maps applicant keys to pointers
+    and records when each entry was archived, which drives retention.
+    """
+
+    def __init__(self, root: str, segment_max_bytes: int = settings.ARCHIVE_SEGMENT_MAX_BYTES):
+        self.root = root
+        self.segment_max_bytes = segment_max_bytes
+        os.makedirs(self.root, exist_ok=True)
+
+    @contextmanager
+    def locked(self):
+        """Hold an exclusive lock on the archive so overlapping runs cannot interleave writes"""
+        with open(os.path.join(self.root, LOCK_FILENAME), "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.root, INDEX_FILENAME)
+
+    def _segments(self) -> List[str]:
+        return sorted(name for name in os.listdir(self.root) if name.endswith(".seg"))
+
+    def _active_segment(self) -> Optional[str]:
+        """The last segment while it still has room, otherwise None"""
+        segments = self._segments()
+        if segments and os.path.getsize(os.path.join(self.root, segments[-1])) < self.segment_max_bytes:
+            return segments[-1]
+        return None
+
+    def _next_segment(self) -> str:
+        """Allocate a new segment name from the counter persisted in the archive root.
+
+        Numbers only ever grow, so a name freed by a purge is never reused and
+        a stale pointer can never resolve to somebody else's documents.
+        """
+        counter_path = os.path.join(self.root, COUNTER_FILENAME)
+        number = 0
+        if os.path.exists(counter_path):
+            with open(counter_path, encoding="utf-8") as f:
+                number = int(f.read().strip() or 0)
+        # archives written before the counter existed only have their segment names
+        for name in self._segments():
+            number = max(number, int(name.split("-")[1].split(".")[0]))
+        number += 1
+        tmp_path = counter_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(str(number))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, counter_path)
+        return f"segment-{number:06d}.seg"
+
+    def put(self, key: str, documents: Dict[str, Optional[bytes]]) -> str:
+        """Append documents for ``key`` and return a durable pointer"""
+        record = _pack(documents)
+        segment = self._active_segment() or self._next_segment()
+        with open(os.path.join(self.root, segment), "ab") as f:
+            offset = f.tell()
+            f.write(record)
+            f.flush()
+            os.fsync(f.fileno())
+        pointer = f"{segment}:{offset}:{len(record)}"
+        entry = {"key": key, "pointer": pointer, "archived_at": datetime.utcnow().isoformat()}
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        return pointer
+
+    def get(self, pointer: str) -> Dict[str, Optional[bytes]]:
+        segment, offset, length = pointer.split(":")
+        with open(os.path.join(self.root, segment), "rb") as f:
+            f.seek(int(offset))
+            return _unpack(f.read(int(length)))
+
+    def read_index(self) -> List[dict]:
+        if not os.path.exists(self.index_path):
+            return []
+        with open(self.index_path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def expired_segments(self, older_than: datetime) -> Dict[str, List[str]]:
+        """Segments whose newest entry is older than ``older_than``, with the keys they hold.
+
+        The segment still being written to is never expired. Nothing is deleted;
+        pass the result to ``remove_segments``.
+        """
+        entries = self.read_index()
+        newest: Dict[str, datetime] = {}
+        for entry in entries:
+            segment = entry["pointer"].split(":")[0]
+            archived_at = datetime.fromisoformat(entry["archived_at"])
+            if segment not in newest or archived_at > newest[segment]:
+                newest[segment] = archived_at
+
+        active = self._active_segment()
+        expired: Dict[str, List[str]] = {
+            segment: [] for segment, archived_at in newest.items()
+            if archived_at < older_than and segment != active
+        }
+        for entry in entries:
+            segment = entry["pointer"].split(":")[0]
+            if segment in expired:
+                expired[segment].append(entry["key"])
+        return expired
+
+    def remove_segments(self, segments) -> None:
+        """Drop ``segments`` from the index, then delete their files"""
+        segments = set(segments)
+        if not segments:
+            return
+        kept = [entry for entry in self.read_index() if entry["pointer"].split(":")[0] not in segments]
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for entry in kept:
+                f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.index_path)
+
+        for segment in segments:
+            path = os.path.join(self.root, segment)
+            if os.path.exists(path):
+                os.remove(path)
+                logger.info(f"Purged archive segment {segment}")
+
+    def purge(self, older_than: datetime) -> List[str]:
+        """Delete segments whose newest entry is older than ``older_than``.
+
+        Returns the keys whose documents were removed.
+        """
+        expired = self.expired_segments(older_than)
+        self.remove_segments(expired)
+        return [key for keys in expired.values() for key in keys]
+
+
+def _archive_key(model, row_id: int) -> str:
+    return f"{model.__tablename__}:{row_id}"
+
+
+def archive_finalized_documents(db: Session, archive: SegmentArchive,
+                                min_age_days: int = settings.ARCHIVE_MIN_AGE_DAYS,
+                                batch_size: int = 100) -> int:
+    """Move documents of applicants finalized more than ``min_age_days`` ago into the archive"""
+    cutoff = datetime.utcnow() - timedelta(days=min_age_days)
+    archived = 0
+    with archive.locked():
+        for model, columns in DOCUMENT_COLUMNS.items():
+            while True:
+                rows = (
+                    db.query(model)
+                    .filter(model.verification_status.in_(FINALIZED_STATUSES))
+                    .filter(model.documents_archive_pointer.is_(None))
+                    # rows finalized before finalized_at existed have no timestamp; treat them as old
+                    .filter(or_(model.finalized_at <= cutoff, model.finalized_at.is_(None)))
+                    .order_by(model.id)
+                    .limit(batch_size)
+                    .all()
+                )
+                if not rows:
+                    break
+                for row in rows:
+                    documents = {name: getattr(row, name) for name in columns}
+                    # the segment write is fsynced before the columns are cleared
+                    row.documents_archive_pointer = archive.put(_archive_key(model, row.id), documents)
+                    for name in columns:
+                        setattr(row, name, None)
+                db.commit()
+                archived += len(rows)
+    logger.info(f"Archived documents for {archived} applicants")
+    return archived
+
+
+def load_archived_documents(archive: SegmentArchive, row) -> Dict[str, Optional[bytes]]:
+    """Return the archived documents for an Investor or Business row"""
+    if not row.documents_archive_pointer:
+        raise LookupError("Documents for this applicant are not archived")
+    if row.documents_archive_pointer == "purged":
+        raise LookupError("Archived documents were purged by the retention policy")
+    return archive.get(row.documents_archive_pointer)
+
+
+def purge_expired_documents(db: Session, archive: SegmentArchive,
+                            retention_days: int = settings.ARCHIVE_RETENTION_DAYS) -> int:
+    """Drop archive segments past retention and mark the affected rows as purged.
+
+    Rows are marked and committed before any file is deleted: a crash in
+    between leaves segments nobody points at, which the next run removes,
+    instead of pointers to documents that no longer exist.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    with archive.locked():
+        expired = archive.expired_segments(cutoff)
+        ids_by_table: Dict[str, List[int]] = {}
+        for keys in expired.values():
+            for key in keys:
+                table, row_id = key.split(":")
+                ids_by_table.setdefault(table, []).append(int(row_id))
+        for model in DOCUMENT_COLUMNS:
+            ids = ids_by_table.get(model.__tablename__)
+            if ids:
+                db.query(model).filter(model.id.in_(ids)).update(
+                    {model.documents_archive_pointer: "purged"}, synchronize_session=False
+                )
+        db.commit()
+        archive.remove_segments(expired)
+    purged = sum(len(keys) for keys in expired.values())
+    logger.info(f"Purged archived documents for {purged} applicants")
+    return purged
+
+
+def main(argv: List[str]) -> int:
+    from .database import SessionLocal
+
+    if len(argv) != 1 or argv[0] not in ("archive", "purge"):
+        print("usage: python -m app.archive {archive|purge}")
+        return 2
+    logging.basicConfig(level=logging.INFO)
+    archive = SegmentArchive(settings.ARCHIVE_DIR)
+    db = SessionLocal()
+    try:
+        if argv[0] == "archive":
+            archive_finalized_documents(db, archive)
+        else:
+            purge_expired_documents(db, archive)
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,10 +1,8 @@
 from datetime import datetime, timedelta
-from jose import JWTError, jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from typing import Optional
-import bcrypt  
 import logging
 
 
@@ -21,7 +19,9 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
+# jose and bcrypt are imported on first use to keep worker boot fast
 def verify_password(plain_password, hashed_password):
+    import bcrypt
     try:
        
         if isinstance(hashed_password, str):
@@ -32,6 +32,7 @@ def verify_password(plain_password, hashed_password):
         return False
 
 def get_password_hash(password):
+    import bcrypt
     try:
        
         salt = bcrypt.gensalt()
@@ -64,6 +65,7 @@ def authenticate_user(db: Session, email: str, password: str):
     return user
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
+    from jose import jwt
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -74,6 +76,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(database.get_db)):
+    from jose import JWTError, jwt
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -3,7 +3,9 @@ import os
 from dotenv import load_dotenv
 
 
-load_dotenv()
+# deployments that inject the environment directly can skip the .env lookup
+if os.getenv("LOAD_DOTENV", "1") == "1":
+    load_dotenv()
 
 class Settings:
     PROJECT_NAME: str = "KYC/KYB API"
@@ -20,4 +22,16 @@ class Settings:
     ALGORITHM = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+    FRONTEND_DIR: str = os.getenv("FRONTEND_DIR", os.path.join(os.path.dirname(__file__), "..", "..", "frontend"))
+    STARTUP_PROFILE: bool = os.getenv("STARTUP_PROFILE", "0") == "1"
+    GZIP_MINIMUM_SIZE: int = int(os.getenv("GZIP_MINIMUM_SIZE", "1024"))
+
+    REGISTRY_MIRROR_PATH: str = os.getenv("REGISTRY_MIRROR_PATH", "registry_mirror.sqlite3")
+    REGISTRY_MAX_AGE_DAYS: int = int(os.getenv("REGISTRY_MAX_AGE_DAYS", "7"))
+
+    ARCHIVE_DIR: str = os.getenv("ARCHIVE_DIR", "archive")
+    ARCHIVE_MIN_AGE_DAYS: int = int(os.getenv("ARCHIVE_MIN_AGE_DAYS", "30"))
+    ARCHIVE_RETENTION_DAYS: int = int(os.getenv("ARCHIVE_RETENTION_DAYS", "1825"))
+    ARCHIVE_SEGMENT_MAX_BYTES: int = int(os.getenv("ARCHIVE_SEGMENT_MAX_BYTES", str(64 * 1024 * 1024)))
+
 settings = Settings()
@@ -1,3 +1,4 @@
+import threading
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
@@ -5,11 +6,36 @@ from .config import settings
 
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+_engine = None
+_engine_lock = threading.Lock()
+_SessionFactory = sessionmaker(autocommit=False, autoflush=False)
 
 Base = declarative_base()
 
+
+def get_engine():
+    """Create the engine on first use so importing the app never touches the DB driver"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                engine = create_engine(SQLALCHEMY_DATABASE_URL)
+                _SessionFactory.configure(bind=engine)
+                _engine = engine
+    return _engine
+
+
+def SessionLocal():
+    get_engine()
+    return _SessionFactory()
+
+
+def __getattr__(name):
+    # keeps `database.engine` working while deferring its creation
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 # Dependency
 def get_db():
     db = SessionLocal()
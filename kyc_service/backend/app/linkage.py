@@ -0,0 +1,272 @@
+"""Entity-linkage index across investors and businesses.
+
+Every applicant contributes normalized keys (phone, ID number, address,
+person, tax number) to the ``applicant_links`` table. Lookups of the other
+applicants sharing a key are a single indexed self-join; the same rows feed a
+connected-component report of clusters that share identities.
+
+Linkage data reveals other applicants' identities, so it is exposed only
+through this operator CLI, never through the public API.
+
+Run from the backend directory:
+    python -m app.linkage rebuild                 # rebuild the index from existing rows
+    python -m app.linkage clusters                # print clusters of linked applicants
+    python -m app.linkage linked investor 12      # applicants sharing keys with one applicant
+"""
+import logging
+import re
+import sys
+from datetime import date
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session, load_only
+
+from . import models
+
+
+logger = logging.getLogger(__name__)
+
+INVESTOR = "investor"
+BUSINESS = "business"
+
+# keys shared by more applicants than this (a call-centre phone, a business-centre
+# address) say nothing about a particular applicant and are left out of lookups
+MAX_KEY_FANOUT = 50
+
+_NON_ALNUM = re.compile(r"[\W_]+")
+_NON_DIGIT = re.compile(r"\D+")
+
+Applicant = Tuple[str, int]
+
+
+def normalize_phone(value: Optional[str]) -> Optional[str]:
+    digits = _NON_DIGIT.sub("", value or "")
+    if len(digits) == 11 and digits[0] == "8":
+        digits = "7" + digits[1:]
+    return digits or None
+
+
+def normalize_identifier(value: Optional[str]) -> Optional[str]:
+    return _NON_ALNUM.sub("", (value or "").lower()) or None
+
+
+def normalize_text(value: Optional[str]) -> Optional[str]:
+    return _NON_ALNUM.sub(" ", (value or "").lower()).strip() or None
+
+
+def person_key(first_name: Optional[str], last_name: Optional[str], dob: Optional[date]) -> Optional[str]:
+    name = normalize_text(f"{first_name or ''} {last_name or ''}")
+    if not name or dob is None:
+        return None
+    return f"{name}|{dob.isoformat()}"
+
+
+def investor_keys(investor) -> Set[Tuple[str, str]]:
+    keys = {
+        ("phone", normalize_phone(investor.phone_number)),
+        ("id_number", normalize_identifier(investor.id_document_number)),
+        ("address", normalize_text(investor.address)),
+        ("tax_number", normalize_identifier(investor.tax_number)),
+        ("person", person_key(investor.first_name, investor.last_name, investor.date_of_birth)),
+    }
+    return {(key_type, value) for key_type, value in keys if value}
+
+
+def business_keys(business) -> Set[Tuple[str, str]]:
+    keys = {
+        ("phone", normalize_phone(business.phone_number)),
+        ("id_number", normalize_identifier(business.director_id_number)),
+        ("address", normalize_text(business.legal_address)),
+        ("address", normalize_text(business.physical_address)),
+        ("tax_number", normalize_identifier(business.tax_number)),
+        ("person", person_key(business.director_first_name, business.director_last_name, business.director_dob)),
+    }
+    return {(key_type, value) for key_type, value in keys if value}
+
+
+# Only the columns the keys are built from; the document LargeBinary columns are never loaded
+_KEY_COLUMNS = {
+    models.Investor: (INVESTOR, investor_keys, (
+        models.Investor.id, models.Investor.phone_number, models.Investor.id_document_number,
+        models.Investor.address, models.Investor.tax_number, models.Investor.first_name,
+        models.Investor.last_name, models.Investor.date_of_birth,
+    )),
+    models.Business: (BUSINESS, business_keys, (
+        models.Business.id, models.Business.phone_number, models.Business.director_id_number,
+        models.Business.legal_address, models.Business.physical_address, models.Business.tax_number,
+        models.Business.director_first_name, models.Business.director_last_name, models.Business.director_dob,
+    )),
+}
+
+
+def _link_rows(applicant_type: str, applicant_id: int, keys: Set[Tuple[str, str]]) -> List[dict]:
+    return [
+        {"key_type": key_type, "key_value": value, "applicant_type": applicant_type, "applicant_id": applicant_id}
+        for key_type, value in sorted(keys)
+    ]
+
+
+def index_applicant(db: Session, applicant) -> None:
+    """Replace the index entries of a single Investor or Business row.
+
+    Only flushes; the caller commits together with the applicant itself.
+    """
+    applicant_type, build_keys, _ = _KEY_COLUMNS[type(applicant)]
+    db.query(models.ApplicantLink).filter(
+        models.ApplicantLink.applicant_type == applicant_type,
+        models.ApplicantLink.applicant_id == applicant.id,
+    ).delete(synchronize_session=False)
+    rows = _link_rows(applicant_type, applicant.id, build_keys(applicant))
+    if rows:
+        db.bulk_insert_mappings(models.ApplicantLink, rows)
+    db.flush()
+
+
+def rebuild_index(db: Session, batch_size: int = 1000) -> int:
+    """Drop and rebuild the whole index from the investors and businesses tables"""
+    db.query(models.ApplicantLink).delete(synchronize_session=False)
+    total = 0
+    for model, (applicant_type, build_keys, columns) in _KEY_COLUMNS.items():
+        last_id = 0
+        while True:
+            batch = (
+                db.query(model)
+                .options(load_only(*columns))
+                .filter(model.id > last_id)
+                .order_by(model.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not batch:
+                break
+            rows = []
+            for applicant in batch:
+                rows.extend(_link_rows(applicant_type, applicant.id, build_keys(applicant)))
+            if rows:
+                db.bulk_insert_mappings(models.ApplicantLink, rows)
+            last_id = batch[-1].id
+            total += len(batch)
+            db.expunge_all()
+    db.commit()
+    logger.info(f"Rebuilt linkage index for {total} applicants")
+    return total
+
+
+def find_linked_applicants(db: Session, applicant_type: str, applicant_id: int,
+                           max_key_fanout: int = MAX_KEY_FANOUT) -> Dict[Applicant, List[str]]:
+    """Return the other applicants sharing at least one key, with the key types they share.
+
+    Each key is read with a LIMIT, so a key held by more than ``max_key_fanout``
+    applicants costs a bounded query and is skipped.
+    """
+    own_keys = (
+        db.query(models.ApplicantLink.key_type, models.ApplicantLink.key_value)
+        .filter(
+            models.ApplicantLink.applicant_type == applicant_type,
+            models.ApplicantLink.applicant_id == applicant_id,
+        )
+        .all()
+    )
+    linked: Dict[Applicant, List[str]] = {}
+    for key_type, key_value in own_keys:
+        members = (
+            db.query(models.ApplicantLink.applicant_type, models.ApplicantLink.applicant_id)
+            .filter(models.ApplicantLink.key_type == key_type, models.ApplicantLink.key_value == key_value)
+            # the applicant itself plus one more than the cap is enough to detect overflow
+            .limit(max_key_fanout + 2)
+            .all()
+        )
+        others = [tuple(member) for member in members if tuple(member) != (applicant_type, applicant_id)]
+        if len(others) > max_key_fanout:
+            continue
+        for other in others:
+            key_types = linked.setdefault(other, [])
+            if key_type not in key_types:
+                key_types.append(key_type)
+    for key_types in linked.values():
+        key_types.sort()
+    return linked
+
+
+def find_clusters(db: Session, min_size: int = 2, max_key_fanout: int = MAX_KEY_FANOUT) -> List[dict]:
+    """Connected components of applicants joined by shared keys.
+
+    Keys shared by more than ``max_key_fanout`` applicants (a call-centre
+    phone, a business-centre address) are skipped so they do not merge
+    unrelated applicants into one component.
+    """
+    groups: Dict[Tuple[str, str], List[Applicant]] = {}
+    query = db.query(
+        models.ApplicantLink.key_type,
+        models.ApplicantLink.key_value,
+        models.ApplicantLink.applicant_type,
+        models.ApplicantLink.applicant_id,
+    ).yield_per(10000)
+    for key_type, key_value, applicant_type, applicant_id in query:
+        groups.setdefault((key_type, key_value), []).append((applicant_type, applicant_id))
+
+    parent: Dict[Applicant, Applicant] = {}
+
+    def find(node: Applicant) -> Applicant:
+        parent.setdefault(node, node)
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    shared: List[Tuple[Tuple[str, str], List[Applicant]]] = []
+    for key, members in groups.items():
+        if len(members) < 2 or len(members) > max_key_fanout:
+            continue
+        shared.append((key, members))
+        first = find(members[0])
+        for member in members[1:]:
+            root = find(member)
+            if root != first:
+                parent[root] = first
+
+    components: Dict[Applicant, dict] = {}
+    for (key_type, key_value), members in shared:
+        component = components.setdefault(find(members[0]), {"applicants": set(), "shared_keys": set()})
+        component["applicants"].update(members)
+        component["shared_keys"].add(key_type)
+
+    clusters = [
+        {"applicants": sorted(c["applicants"]), "shared_keys": sorted(c["shared_keys"])}
+        for c in components.values()
+        if len(c["applicants"]) >= min_size
+    ]
+    clusters.sort(key=lambda c: len(c["applicants"]), reverse=True)
+    return clusters
+
+
+def main(argv: List[str]) -> int:
+    from .database import SessionLocal
+
+    valid = (
+        argv[:1] == ["rebuild"] and len(argv) == 1
+        or argv[:1] == ["clusters"] and len(argv) == 1
+        or argv[:1] == ["linked"] and len(argv) == 3 and argv[1] in (INVESTOR, BUSINESS) and argv[2].isdigit()
+    )
+    if not valid:
+        print("usage: python -m app.linkage {rebuild|clusters|linked {investor|business} <id>}")
+        return 2
+    logging.basicConfig(level=logging.INFO)
+    db = SessionLocal()
+    try:
+        if argv[0] == "rebuild":
+            rebuild_index(db)
+        elif argv[0] == "clusters":
+            for cluster in find_clusters(db):
+                members = ", ".join(f"{t}:{i}" for t, i in cluster["applicants"])
+                print(f"{len(cluster['applicants'])} applicants sharing {', '.join(cluster['shared_keys'])}: {members}")
+        else:
+            for (other_type, other_id), key_types in find_linked_applicants(db, argv[1], int(argv[2])).items():
+                print(f"{other_type}:{other_id} shares {', '.join(key_types)}")
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
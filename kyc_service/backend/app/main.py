@@ -1,16 +1,26 @@
+import time
+_IMPORT_STARTED = time.perf_counter()
+
 from fastapi import FastAPI, Depends, HTTPException, status, File, UploadFile, Form, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 from typing import Optional, List
 import base64
-from datetime import date
+from datetime import date, datetime
 from . import database
 from . import models
 from . import schemas
 from . import auth
+from . import static
+from . import profiling
+from . import linkage
+from .config import settings
 from .verification import perform_kyc_checks, perform_kyb_checks, validate_phone_number, validate_iin, validate_business_registration_number, validate_tax_number
 
-app = FastAPI(title="KYC/KYB API", version="1.0.0")
+app = FastAPI(title="KYC/KYB API", version="1.0.0", default_response_class=ORJSONResponse)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  
@@ -18,11 +28,22 @@ app.add_middleware(
     allow_methods=["*"],  
     allow_headers=["*"], 
 )
+app.add_middleware(static.APIGZipMiddleware, minimum_size=settings.GZIP_MINIMUM_SIZE)
 
 
 @app.on_event("startup")
 def startup_event():
-    models.Base.metadata.create_all(bind=database.engine)
+    # schema changes are applied by `python -m app.migrate`, not by every worker
+    with profiling.timed("startup load_frontend"):
+        static.load_frontend()
+    profiling.report()
+
+
+@app.get("/health/ready", include_in_schema=False)
+def readiness():
+    with database.get_engine().connect() as connection:
+        connection.execute(text("SELECT 1"))
+    return {"status": "ready"}
 
 
 def get_db():
@@ -33,6 +54,14 @@ def get_db():
         db.close()
 
 
+def serialize_response(model: type[BaseModel], obj) -> Response:
+    """Validate an ORM object and dump it straight to JSON bytes with pydantic-core"""
+    return Response(
+        content=model.model_validate(obj).model_dump_json(),
+        media_type="application/json"
+    )
+
+
 def process_investor_verification(investor_id: int, db: Session):
     """Background task to process investor verification"""
     investor = db.query(models.Investor).filter(models.Investor.id == investor_id).first()
@@ -57,6 +86,7 @@ def process_investor_verification(investor_id: int, db: Session):
         else:
             investor.verification_status = 'rejected'
             investor.rejection_reason = "Failed government verification"
+        investor.finalized_at = datetime.utcnow()
         
         db.commit()
         
@@ -64,6 +94,7 @@ def process_investor_verification(investor_id: int, db: Session):
 
         investor.verification_status = 'rejected'
         investor.rejection_reason = f"Verification error: {str(e)}"
+        investor.finalized_at = datetime.utcnow()
         db.commit()
 
 def process_business_verification(business_id: int, db: Session):
@@ -92,6 +123,7 @@ def process_business_verification(business_id: int, db: Session):
         else:
             business.verification_status = 'rejected'
             business.rejection_reason = "Failed government verification"
+        business.finalized_at = datetime.utcnow()
         
         db.commit()
         
@@ -99,6 +131,7 @@ def process_business_verification(business_id: int, db: Session):
 
         business.verification_status = 'rejected'
         business.rejection_reason = f"Verification error: {str(e)}"
+        business.finalized_at = datetime.utcnow()
         db.commit()
 
 
@@ -181,13 +214,15 @@ def register_investor(
     )
     
     db.add(investor)
+    db.flush()
+    linkage.index_applicant(db, investor)
+    investor_id = investor.id
     db.commit()
-    db.refresh(investor)
     
 
-    background_tasks.add_task(process_investor_verification, investor.id, db)
+    background_tasks.add_task(process_investor_verification, investor_id, db)
     
-    return {"message": "Investor registered successfully", "investor_id": investor.id}
+    return {"message": "Investor registered successfully", "investor_id": investor_id}
 
 @app.post("/register/business")
 def register_business(
@@ -262,13 +297,15 @@ def register_business(
     )
     
     db.add(business)
+    db.flush()
+    linkage.index_applicant(db, business)
+    business_id = business.id
     db.commit()
-    db.refresh(business)
     
    
-    background_tasks.add_task(process_business_verification, business.id, db)
+    background_tasks.add_task(process_business_verification, business_id, db)
     
-    return {"message": "Business registered successfully", "business_id": business.id}
+    return {"message": "Business registered successfully", "business_id": business_id}
 
 
 @app.post("/login")
@@ -287,21 +324,24 @@ def login(form_data: schemas.UserLogin, db: Session = Depends(get_db)):
 
 @app.get("/users/me", response_model=schemas.UserResponse)
 async def read_users_me(current_user: schemas.UserResponse = Depends(auth.get_current_active_user)):
-    return current_user
+    return serialize_response(schemas.UserResponse, current_user)
 
 @app.get("/investor/{user_id}", response_model=schemas.InvestorResponse)
 def get_investor(user_id: int, db: Session = Depends(get_db)):
     investor = db.query(models.Investor).filter(models.Investor.user_id == user_id).first()
     if not investor:
         raise HTTPException(status_code=404, detail="Investor not found")
-    return investor
+    return serialize_response(schemas.InvestorResponse, investor)
 
 @app.get("/business/{user_id}", response_model=schemas.BusinessResponse)
 def get_business(user_id: int, db: Session = Depends(get_db)):
     business = db.query(models.Business).filter(models.Business.user_id == user_id).first()
     if not business:
         raise HTTPException(status_code=404, detail="Business not found")
-    return business
+    return serialize_response(schemas.BusinessResponse, business)
+
+app.include_router(static.router)
+profiling.record("import app.main", time.perf_counter() - _IMPORT_STARTED)
 
 if __name__ == "__main__":
     import uvicorn
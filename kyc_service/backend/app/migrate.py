@@ -0,0 +1,45 @@
+"""Explicit schema management, run once per deploy instead of on every worker boot.
+
+Run from the backend directory:  python -m app.migrate
+
+Applies the Alembic revisions in ``alembic/versions`` up to head. Databases
+created by the old startup ``create_all`` have no ``alembic_version`` table;
+they are stamped at the initial revision first so only later changes run.
+"""
+import logging
+import os
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+
+from .database import get_engine
+
+
+logger = logging.getLogger(__name__)
+
+BASELINE_REVISION = "0001"
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+
+
+def alembic_config() -> Config:
+    return Config(ALEMBIC_INI)
+
+
+def upgrade(engine=None, revision: str = "head"):
+    engine = engine if engine is not None else get_engine()
+    config = alembic_config()
+    config.attributes["configure_logging"] = False
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        inspector = inspect(connection)
+        if not inspector.has_table("alembic_version") and inspector.has_table("users"):
+            logger.info(f"Existing schema without migration history, stamping revision {BASELINE_REVISION}")
+            command.stamp(config, BASELINE_REVISION)
+        command.upgrade(config, revision)
+    logger.info(f"Database schema upgraded to {revision}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    upgrade()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, ForeignKey, Text, LargeBinary
+from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, ForeignKey, Text, LargeBinary, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .database import Base
@@ -38,6 +38,8 @@ class Investor(Base):
     risk_level = Column(String, default="medium")
     verification_status = Column(String, default="pending")  
     rejection_reason = Column(Text)
+    finalized_at = Column(DateTime)
+    documents_archive_pointer = Column(String)
     
     user = relationship("User", back_populates="investor")
 
@@ -68,5 +70,21 @@ class Business(Base):
     email = Column(String, nullable=False)
     verification_status = Column(String, default="pending") 
     rejection_reason = Column(Text)
+    finalized_at = Column(DateTime)
+    documents_archive_pointer = Column(String)
     
     user = relationship("User", back_populates="business")
+
+class ApplicantLink(Base):
+    __tablename__ = "applicant_links"
+    
+    id = Column(Integer, primary_key=True)
+    key_type = Column(String, nullable=False)  
+    key_value = Column(String, nullable=False)
+    applicant_type = Column(String, nullable=False)  
+    applicant_id = Column(Integer, nullable=False)
+    
+    __table_args__ = (
+        Index("ix_applicant_links_key", "key_type", "key_value"),
+        Index("ix_applicant_links_applicant", "applicant_type", "applicant_id"),
+    )
@@ -0,0 +1,80 @@
+"""Startup profiling.
+
+With ``STARTUP_PROFILE=1`` each worker records how long ``import app.main``
+took, times its startup steps and writes the report to stderr, since uvicorn
+attaches no handlers to application loggers. ``python -m app.profiling``
+additionally reports the slowest imports of ``app.main`` (via
+``python -X importtime``) and the total time to a ready app.
+"""
+import os
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from typing import List, Tuple
+
+from .config import settings
+
+
+_timings: List[Tuple[str, float]] = []
+
+
+@contextmanager
+def timed(label: str):
+    if not settings.STARTUP_PROFILE:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _timings.append((label, time.perf_counter() - start))
+
+
+def record(label: str, seconds: float):
+    if settings.STARTUP_PROFILE:
+        _timings.append((label, seconds))
+
+
+def report():
+    if not settings.STARTUP_PROFILE:
+        return
+    for label, seconds in _timings:
+        print(f"startup profile: {label}: {seconds * 1000:.1f} ms", file=sys.stderr, flush=True)
+    _timings.clear()
+
+
+def import_times(module: str = "app.main", limit: int = 15) -> List[Tuple[str, float]]:
+    """Return the modules with the highest cumulative import time, in seconds"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line.split("|")
+        rows.append((name.strip(), int(cumulative_us) / 1e6))
+    rows.sort(key=lambda row: row[1], reverse=True)
+    return rows[:limit]
+
+
+def main():
+    print("Slowest imports (cumulative):")
+    for name, seconds in import_times():
+        print(f"  {seconds * 1000:8.1f} ms  {name}")
+
+    start = time.perf_counter()
+    from .main import startup_event
+    imported = time.perf_counter()
+    startup_event()
+    ready = time.perf_counter()
+    print(f"import app.main: {(imported - start) * 1000:.1f} ms")
+    print(f"startup handlers: {(ready - imported) * 1000:.1f} ms")
+    print(f"total to ready: {(ready - start) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    settings.STARTUP_PROFILE = True
+    main()
@@ -0,0 +1,307 @@
+"""Local mirror of the government business (BIN) and identity (IIN) registries.
+
+Bulk registry dumps are loaded into a SQLite file at
+``settings.REGISTRY_MIRROR_PATH``. An in-memory bloom filter, persisted next
+to the data, answers most misses without touching SQLite. Entries older than
+``settings.REGISTRY_MAX_AGE_DAYS`` are treated as stale so the caller falls
+back to the live provider.
+
+Run from the backend directory:
+    python -m app.registry businesses dump.csv          # full import, columns bin,name,status
+    python -m app.registry persons dump.csv --delta     # delta import, columns iin,full_name,dob,status
+"""
+import csv
+import hashlib
+import re
+import logging
+import math
+import os
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+from .config import settings
+
+
+logger = logging.getLogger(__name__)
+
+BUSINESSES = "businesses"
+PERSONS = "persons"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS businesses (
+    bin TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    updated_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS persons (
+    iin TEXT PRIMARY KEY,
+    full_name TEXT NOT NULL,
+    dob TEXT,
+    status TEXT NOT NULL,
+    updated_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS bloom (
+    name TEXT PRIMARY KEY,
+    bits BLOB NOT NULL,
+    hashes INTEGER NOT NULL,
+    generation INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+"""
+
+_NON_DIGIT = re.compile(r"\D+")
+DOB_FORMATS = ("%Y-%m-%d", "%d.%m.%Y", "%d/%m/%Y")
+# lookups give up quickly on a locked file; callers fall back to the live provider
+BUSY_TIMEOUT_SECONDS = 0.1
+
+
+def normalize_number(value: Optional[str]) -> str:
+    """BIN/IIN as digits only, so dashed and plain spellings share one key"""
+    return _NON_DIGIT.sub("", value or "")
+
+
+def normalize_dob(value: Optional[str]) -> Optional[str]:
+    """Registry dates as ISO strings; raises ValueError for unknown formats"""
+    value = (value or "").strip()
+    if not value:
+        return None
+    for date_format in DOB_FORMATS:
+        try:
+            return datetime.strptime(value, date_format).date().isoformat()
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognized date {value!r}")
+
+
+_COLUMNS = {
+    BUSINESSES: ("bin", "name", "status"),
+    PERSONS: ("iin", "full_name", "dob", "status"),
+}
+
+_SELECT = {
+    table: f"SELECT {', '.join(columns[1:])}, updated_at FROM {table} WHERE {columns[0]} = ?"
+    for table, columns in _COLUMNS.items()
+}
+
+
+class BloomFilter:
+    def __init__(self, size_bits: int, hashes: int, bits: Optional[bytearray] = None):
+        self.size_bits = size_bits
+        self.hashes = hashes
+        self.bits = bits if bits is not None else bytearray((size_bits + 7) // 8)
+
+    @classmethod
+    def for_capacity(cls, capacity: int, error_rate: float = 0.01) -> "BloomFilter":
+        capacity = max(capacity, 1)
+        size_bits = max(64, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        # whole bytes, so the size can be recovered from the persisted bit array
+        size_bits = (size_bits + 7) // 8 * 8
+        hashes = max(1, round(size_bits / capacity * math.log(2)))
+        return cls(size_bits, hashes)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size_bits
+
+    def add(self, key: str):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        bits = self.bits
+        for position in self._positions(key):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+
+class RegistryMirror:
+    def __init__(self, path: str, max_age_days: int = settings.REGISTRY_MAX_AGE_DAYS):
+        self.path = path
+        self.max_age_seconds = max_age_days * 86400
+        self._local = threading.local()
+        self._blooms = {}
+        self._generations = {}
+        # WAL lets lookups keep reading committed data while an import is writing
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(_SCHEMA)
+        columns = [row[1] for row in self.connection.execute("PRAGMA table_info(bloom)")]
+        if "generation" not in columns:
+            # mirror files written before the generation counter existed
+            with self.connection:
+                self.connection.execute("ALTER TABLE bloom ADD COLUMN generation INTEGER NOT NULL DEFAULT 0")
+        for table in _COLUMNS:
+            self._load_bloom(table)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_SECONDS)
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        # sqlite connections are per thread; request handlers run in a threadpool
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._connect()
+            self._local.connection = connection
+        return connection
+
+    def _load_bloom(self, table: str) -> BloomFilter:
+        row = self.connection.execute(
+            "SELECT bits, hashes, generation FROM bloom WHERE name = ?", (table,)
+        ).fetchone()
+        if row is None:
+            return self._rebuild_bloom(table)
+        bits, hashes, generation = row
+        bloom = BloomFilter(len(bits) * 8, hashes, bytearray(bits))
+        self._blooms[table] = bloom
+        self._generations[table] = generation
+        return bloom
+
+    def _refresh_blooms(self):
+        """Reload filters rebuilt by an import through another connection"""
+        # data_version changes whenever another connection has committed to the file
+        data_version = self.connection.execute("PRAGMA data_version").fetchone()[0]
+        if data_version == getattr(self._local, "data_version", None):
+            return
+        self._local.data_version = data_version
+        for table, generation in self.connection.execute("SELECT name, generation FROM bloom"):
+            if self._generations.get(table) != generation:
+                self._load_bloom(table)
+
+    def _rebuild_bloom(self, table: str) -> BloomFilter:
+        key = _COLUMNS[table][0]
+        count = self.connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        bloom = BloomFilter.for_capacity(count)
+        for (value,) in self.connection.execute(f"SELECT {key} FROM {table}"):
+            bloom.add(value)
+        with self.connection:
+            row = self.connection.execute("SELECT generation FROM bloom WHERE name = ?", (table,)).fetchone()
+            generation = (row[0] if row is not None else 0) + 1
+            self.connection.execute(
+                "INSERT OR REPLACE INTO bloom (name, bits, hashes, generation) VALUES (?, ?, ?, ?)",
+                (table, bytes(bloom.bits), bloom.hashes, generation),
+            )
+        self._blooms[table] = bloom
+        self._generations[table] = generation
+        return bloom
+
+    def _normalize_row(self, table: str, row: dict) -> tuple:
+        key = normalize_number(row.get(_COLUMNS[table][0]))
+        if not key:
+            raise ValueError("missing key")
+        values = {column: (row.get(column) or "").strip() or None for column in _COLUMNS[table][1:]}
+        for column, value in values.items():
+            if value is None and column != "dob":
+                raise ValueError(f"missing {column}")
+        if "dob" in values:
+            values["dob"] = normalize_dob(values["dob"])
+        return (key,) + tuple(values.values())
+
+    def import_rows(self, table: str, rows: Iterable[dict], delta: bool = False) -> int:
+        """Load registry rows; a full import replaces the table, a delta import upserts.
+
+        Rows with a missing key, name or status, or an unparseable date, are
+        skipped and reported in the log rather than aborting the import.
+        """
+        columns = _COLUMNS[table]
+        now = time.time()
+        placeholders = ", ".join("?" for _ in range(len(columns) + 1))
+        sql = f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}, updated_at) VALUES ({placeholders})"
+        count = 0
+        skipped = []
+        with self.connection:
+            if not delta:
+                self.connection.execute(f"DELETE FROM {table}")
+            batch = []
+            for line, row in enumerate(rows, start=1):
+                try:
+                    batch.append(self._normalize_row(table, row) + (now,))
+                except ValueError as e:
+                    skipped.append(f"row {line}: {e}")
+                    continue
+                if len(batch) >= 10000:
+                    self.connection.executemany(sql, batch)
+                    count += len(batch)
+                    batch = []
+            if batch:
+                self.connection.executemany(sql, batch)
+                count += len(batch)
+        # delta imports can overflow the filter's capacity, so it is always resized
+        self._rebuild_bloom(table)
+        if skipped:
+            logger.warning(f"Skipped {len(skipped)} invalid rows in {table} import: {'; '.join(skipped[:10])}")
+        logger.info(f"Imported {count} rows into registry mirror table {table}")
+        return count
+
+    def _lookup(self, table: str, key: str) -> Optional[tuple]:
+        """Fresh registry row for ``key``; None on a miss, a stale entry or a SQLite error"""
+        key = normalize_number(key)
+        if not key:
+            return None
+        try:
+            self._refresh_blooms()
+            if key not in self._blooms[table]:
+                return None
+            row = self.connection.execute(_SELECT[table], (key,)).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Registry mirror lookup in {table} failed, using live provider: {e}")
+            return None
+        if row is None or time.time() - row[-1] > self.max_age_seconds:
+            return None
+        return row[:-1]
+
+    def lookup_business(self, bin_number: str) -> Optional[dict]:
+        row = self._lookup(BUSINESSES, bin_number)
+        if row is None:
+            return None
+        name, status = row
+        return {"name": name, "status": status}
+
+    def lookup_person(self, iin: str) -> Optional[dict]:
+        row = self._lookup(PERSONS, iin)
+        if row is None:
+            return None
+        full_name, dob, status = row
+        return {"full_name": full_name, "dob": dob, "status": status}
+
+
+_mirror: Optional[RegistryMirror] = None
+_mirror_lock = threading.Lock()
+
+
+def get_mirror() -> Optional[RegistryMirror]:
+    """Open the mirror on first use; None when no mirror file has been imported"""
+    global _mirror
+    if _mirror is None:
+        if not os.path.exists(settings.REGISTRY_MIRROR_PATH):
+            return None
+        with _mirror_lock:
+            if _mirror is None:
+                try:
+                    _mirror = RegistryMirror(settings.REGISTRY_MIRROR_PATH)
+                except sqlite3.Error as e:
+                    logger.warning(f"Registry mirror unavailable, using live provider: {e}")
+                    return None
+    return _mirror
+
+
+def main(argv: List[str]) -> int:
+    if len(argv) not in (2, 3) or argv[0] not in _COLUMNS or (len(argv) == 3 and argv[2] != "--delta"):
+        print("usage: python -m app.registry {businesses|persons} <dump.csv> [--delta]")
+        return 2
+    logging.basicConfig(level=logging.INFO)
+    mirror = RegistryMirror(settings.REGISTRY_MIRROR_PATH)
+    with open(argv[1], newline="", encoding="utf-8") as f:
+        mirror.import_rows(argv[0], csv.DictReader(f), delta=len(argv) == 3)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
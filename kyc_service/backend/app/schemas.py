@@ -1,13 +1,23 @@
-from pydantic import BaseModel, EmailStr, validator
-from typing import Optional
+from pydantic import AfterValidator, BaseModel, ConfigDict, EmailStr, field_validator
+from typing import Annotated, Optional
 from datetime import date, datetime
-import re
+from .validators import PHONE_NUMBER_MESSAGE, is_valid_phone_number
+
+
+def _check_phone_number(v: str) -> str:
+    if not is_valid_phone_number(v):
+        raise ValueError(PHONE_NUMBER_MESSAGE)
+    return v
+
+
+PhoneNumber = Annotated[str, AfterValidator(_check_phone_number)]
 
 class UserBase(BaseModel):
     email: EmailStr
     user_type: str
 
-    @validator('user_type')
+    @field_validator('user_type')
+    @classmethod
     def validate_user_type(cls, v):
         if v not in ["investor", "business"]:
             raise ValueError('User type must be either "investor" or "business"')
@@ -16,7 +26,8 @@ class UserBase(BaseModel):
 class UserCreate(UserBase):
     password: str
 
-    @validator('password')
+    @field_validator('password')
+    @classmethod
     def validate_password(cls, v):
         if len(v) < 8:
             raise ValueError('Password must be at least 8 characters long')
@@ -36,26 +47,18 @@ class UserResponse(UserBase):
     is_verified: bool
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class InvestorBase(BaseModel):
     first_name: str
     last_name: str
     date_of_birth: date
-    phone_number: str
+    phone_number: PhoneNumber
     id_document_type: str
     id_document_number: str
     address: str
     tax_number: Optional[str] = None
 
-    @validator('phone_number')
-    def validate_phone_number(cls, v):
-        pattern = r'^\+7\d{10}$|^8\d{10}$'
-        if not re.match(pattern, v):
-            raise ValueError('Phone number must be in format +7XXXXXXXXXX or 8XXXXXXXXXX')
-        return v
-
 class InvestorCreate(InvestorBase):
     pass
 
@@ -65,8 +68,7 @@ class InvestorResponse(InvestorBase):
     verification_status: str
     rejection_reason: Optional[str] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class BusinessBase(BaseModel):
     company_name: str
@@ -95,8 +97,7 @@ class BusinessResponse(BusinessBase):
     verification_status: str
     rejection_reason: Optional[str] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class Token(BaseModel):
     access_token: str
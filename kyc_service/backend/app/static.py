@@ -0,0 +1,206 @@
+"""Serving of the frontend from the API process.
+
+At startup every file in ``settings.FRONTEND_DIR`` is read once, compressed
+to gzip (and brotli when the ``brotli`` package is installed) and kept in
+memory. Stylesheets and scripts get content-hashed names under ``/assets``
+and are served as immutable; HTML pages keep their names, are rewritten to
+point at the hashed assets and are revalidated with an ETag on every load.
+"""
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+from typing import Dict, Optional
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import Response
+
+from .config import settings
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+
+logger = logging.getLogger(__name__)
+
+ASSETS_PREFIX = "/assets/"
+HASHED_EXTENSIONS = (".css", ".js")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+
+class Asset:
+    def __init__(self, content: bytes, content_type: str, cache_control: str):
+        self.content_type = content_type
+        self.cache_control = cache_control
+        digest = hashlib.sha256(content).hexdigest()[:16]
+        self.digest = digest
+        self.variants: Dict[str, bytes] = {"identity": content}
+        self.etags: Dict[str, str] = {"identity": f'"{digest}"'}
+
+        gzipped = gzip.compress(content, compresslevel=9, mtime=0)
+        if len(gzipped) < len(content):
+            self.variants["gzip"] = gzipped
+            self.etags["gzip"] = f'"{digest}-gzip"'
+        if brotli is not None:
+            compressed = brotli.compress(content, quality=11)
+            if len(compressed) < len(content):
+                self.variants["br"] = compressed
+                self.etags["br"] = f'"{digest}-br"'
+
+
+class FrontendBundle:
+    def __init__(self):
+        self.pages: Dict[str, Asset] = {}
+        self.assets: Dict[str, Asset] = {}
+
+
+_bundle: Optional[FrontendBundle] = None
+
+
+def _content_type(name: str) -> str:
+    # Starlette's Response appends the charset for text/* itself
+    return mimetypes.guess_type(name)[0] or "application/octet-stream"
+
+
+def build_frontend(frontend_dir: str = settings.FRONTEND_DIR) -> FrontendBundle:
+    """Hash, rewrite and precompress every file in the frontend directory"""
+    bundle = FrontendBundle()
+    renames: Dict[str, str] = {}
+    pages: Dict[str, bytes] = {}
+
+    for name in sorted(os.listdir(frontend_dir)):
+        path = os.path.join(frontend_dir, name)
+        if not os.path.isfile(path):
+            continue
+        with open(path, "rb") as f:
+            content = f.read()
+        if name.endswith(".html"):
+            pages[name] = content
+            continue
+        if name.endswith(HASHED_EXTENSIONS):
+            asset = Asset(content, _content_type(name), IMMUTABLE_CACHE_CONTROL)
+            stem, ext = os.path.splitext(name)
+            hashed_name = f"{stem}.{asset.digest[:10]}{ext}"
+        else:
+            asset = Asset(content, _content_type(name), REVALIDATE_CACHE_CONTROL)
+            hashed_name = name
+        renames[name] = ASSETS_PREFIX + hashed_name
+        bundle.assets[hashed_name] = asset
+
+    for name, content in pages.items():
+        html = content.decode("utf-8")
+        for original, hashed in renames.items():
+            html = html.replace(f'href="{original}"', f'href="{hashed}"')
+            html = html.replace(f'src="{original}"', f'src="{hashed}"')
+        bundle.pages[name] = Asset(html.encode("utf-8"), _content_type(name), REVALIDATE_CACHE_CONTROL)
+
+    logger.info(f"Built frontend: {len(bundle.pages)} pages, {len(bundle.assets)} assets")
+    return bundle
+
+
+def load_frontend(frontend_dir: str = settings.FRONTEND_DIR):
+    global _bundle
+    if not os.path.isdir(frontend_dir):
+        logger.warning(f"Frontend directory {frontend_dir} not found, serving the API without the UI")
+        _bundle = FrontendBundle()
+        return
+    _bundle = build_frontend(frontend_dir)
+
+
+def _accepted_encodings(request: Request) -> Dict[str, float]:
+    accepted = {}
+    for part in request.headers.get("accept-encoding", "").split(","):
+        token, _, params = part.strip().partition(";")
+        if not token:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[token.strip().lower()] = quality
+    return accepted
+
+
+def serve_asset(request: Request, asset: Asset) -> Response:
+    accepted = _accepted_encodings(request)
+    # "*" covers every coding the client did not list explicitly
+    wildcard = accepted.get("*", 0)
+    encoding = "identity"
+    for candidate in ("br", "gzip"):
+        if candidate in asset.variants and accepted.get(candidate, wildcard) > 0:
+            encoding = candidate
+            break
+
+    headers = {
+        "Cache-Control": asset.cache_control,
+        "ETag": asset.etags[encoding],
+        "Vary": "Accept-Encoding",
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        known = set(asset.etags.values())
+        for tag in if_none_match.split(","):
+            tag = tag.strip().removeprefix("W/")
+            if tag == "*" or tag in known:
+                if tag != "*":
+                    headers["ETag"] = tag
+                return Response(status_code=304, headers=headers)
+
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=asset.variants[encoding], media_type=asset.content_type, headers=headers)
+
+
+def is_frontend_path(path: str) -> bool:
+    return path == "/" or path.startswith(ASSETS_PREFIX) or path.endswith(".html")
+
+
+class APIGZipMiddleware(GZipMiddleware):
+    """GZip for API responses; frontend files are already precompressed"""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and is_frontend_path(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+def _get_bundle() -> FrontendBundle:
+    if _bundle is None:
+        load_frontend()
+    return _bundle
+
+
+router = APIRouter(include_in_schema=False)
+
+
+@router.get("/")
+def index(request: Request):
+    found = _get_bundle().pages.get("index.html")
+    if found is None:
+        raise HTTPException(status_code=404, detail="Not found")
+    return serve_asset(request, found)
+
+
+@router.get("/assets/{name}")
+def asset(name: str, request: Request):
+    found = _get_bundle().assets.get(name)
+    if found is None:
+        raise HTTPException(status_code=404, detail="Not found")
+    return serve_asset(request, found)
+
+
+@router.get("/{page}.html")
+def page(page: str, request: Request):
+    found = _get_bundle().pages.get(f"{page}.html")
+    if found is None:
+        raise HTTPException(status_code=404, detail="Not found")
+    return serve_asset(request, found)
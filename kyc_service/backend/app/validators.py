@@ -0,0 +1,10 @@
+import re
+
+
+PHONE_NUMBER_PATTERN = re.compile(r'^\+7\d{10}$|^8\d{10}$')
+PHONE_NUMBER_MESSAGE = "Phone number must be in format +7XXXXXXXXXX or 8XXXXXXXXXX"
+
+
+def is_valid_phone_number(phone_number: str) -> bool:
+    """Check a Kazakhstan phone number against the precompiled pattern"""
+    return PHONE_NUMBER_PATTERN.match(phone_number) is not None
@@ -1,15 +1,15 @@
-import requests
 from fastapi import HTTPException, status
-import re
 from datetime import datetime, date
+import re
+from .validators import PHONE_NUMBER_MESSAGE, is_valid_phone_number
+from .registry import get_mirror
 
 def validate_phone_number(phone_number: str):
     """Validate Kazakhstan phone number format"""
-    pattern = r'^\+7\d{10}$|^8\d{10}$'
-    if not re.match(pattern, phone_number):
+    if not is_valid_phone_number(phone_number):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Phone number must be in format +7XXXXXXXXXX or 8XXXXXXXXXX"
+            detail=PHONE_NUMBER_MESSAGE
         )
     return True
 
@@ -68,18 +68,63 @@ def validate_tax_number(tax_number: str):
     return True
 
 
-def verify_identity_with_government_db(iin: str, full_name: str, dob: date):
+ACTIVE_REGISTRY_STATUS = "active"
+
+
+def _name_tokens(name: str) -> set:
+    return set(re.findall(r"\w+", name.casefold()))
+
+
+def _names_match(registry_name: str, provided_name: str) -> bool:
+    """Word order and extra words (a patronymic, a legal-form suffix) on either side do not matter"""
+    registry_tokens = _name_tokens(registry_name)
+    provided_tokens = _name_tokens(provided_name)
+    if not registry_tokens or not provided_tokens:
+        return False
+    return provided_tokens <= registry_tokens or registry_tokens <= provided_tokens
+
+
+def _live_verify_identity(iin: str, full_name: str, dob: date):
     """Stub function for integration with government identity verification"""
    
     print(f"Verifying identity with government DB: IIN={iin}, Name={full_name}, DOB={dob}")
     return {"status": "verified", "confidence": "high"}
 
-def verify_business_with_government_db(reg_number: str, company_name: str):
+def _live_verify_business(reg_number: str, company_name: str):
     """Stub function for integration with government business verification"""
   
     print(f"Verifying business with government DB: RegNumber={reg_number}, Name={company_name}")
     return {"status": "verified", "confidence": "high"}
 
+def verify_identity_with_government_db(iin: str, full_name: str, dob: date):
+    """Verify identity against the local registry mirror, falling back to the live registry"""
+    mirror = get_mirror()
+    record = mirror.lookup_person(iin) if mirror is not None else None
+    if record is None:
+        return _live_verify_identity(iin, full_name, dob)
+
+    if record["status"].lower() != ACTIVE_REGISTRY_STATUS:
+        return {"status": "not_verified", "confidence": "high", "source": "mirror", "reason": f"IIN status is {record['status']}"}
+    if not _names_match(record["full_name"], full_name):
+        # spelling differences are for the live registry to judge, not grounds for rejection
+        return _live_verify_identity(iin, full_name, dob)
+    if record["dob"] and dob is not None and record["dob"] != dob.isoformat():
+        return {"status": "not_verified", "confidence": "high", "source": "mirror", "reason": "Date of birth does not match registry"}
+    return {"status": "verified", "confidence": "high", "source": "mirror"}
+
+def verify_business_with_government_db(reg_number: str, company_name: str):
+    """Verify a business against the local registry mirror, falling back to the live registry"""
+    mirror = get_mirror()
+    record = mirror.lookup_business(reg_number) if mirror is not None else None
+    if record is None:
+        return _live_verify_business(reg_number, company_name)
+
+    if record["status"].lower() != ACTIVE_REGISTRY_STATUS:
+        return {"status": "not_verified", "confidence": "high", "source": "mirror", "reason": f"BIN status is {record['status']}"}
+    if not _names_match(record["name"], company_name):
+        return _live_verify_business(reg_number, company_name)
+    return {"status": "verified", "confidence": "high", "source": "mirror"}
+
 def check_sanctions_list(full_name: str, dob: date):
     """Stub function for checking against sanctions lists"""
    
@@ -0,0 +1,83 @@
+# backend/benchmarks/bench_schemas.py
+"""Per-request validation + serialization cost for InvestorResponse/BusinessResponse.
+
+Run from the backend directory:  python -m benchmarks.bench_schemas
+"""
+import json
+import timeit
+from datetime import date
+from types import SimpleNamespace
+
+from fastapi.encoders import jsonable_encoder
+
+from app import schemas
+
+
+ITERATIONS = 20000
+
+
+def make_investor():
+    return SimpleNamespace(
+        id=1,
+        user_id=1,
+        first_name="Aigerim",
+        last_name="Nurlanovna",
+        date_of_birth=date(1990, 5, 17),
+        phone_number="+77011234567",
+        id_document_type="id_card",
+        id_document_number="900517400123",
+        address="Almaty, Abay ave. 10",
+        tax_number=None,
+        verification_status="approved",
+        rejection_reason=None,
+    )
+
+
+def make_business():
+    return SimpleNamespace(
+        id=1,
+        user_id=2,
+        company_name="Steppe Trading LLP",
+        registration_number="1234567890",
+        registration_date=date(2015, 3, 1),
+        tax_number="150340012345",
+        legal_address="Astana, Mangilik El 55",
+        physical_address="Astana, Mangilik El 55",
+        business_type="LLP",
+        industry="retail",
+        director_first_name="Daulet",
+        director_last_name="Serikov",
+        director_dob=date(1982, 11, 2),
+        director_id_number="821102300456",
+        ownership_structure=None,
+        website="https://example.kz",
+        phone_number="+77017654321",
+        email="info@example.kz",
+        verification_status="pending",
+        rejection_reason=None,
+    )
+
+
+def default_path(model, obj):
+    """What FastAPI does for a response_model: validate, jsonable_encoder, json.dumps"""
+    return json.dumps(jsonable_encoder(model.model_validate(obj))).encode("utf-8")
+
+
+def model_json_path(model, obj):
+    """model_validate with pydantic-core JSON dump, as serialize_response does"""
+    return model.model_validate(obj).model_dump_json()
+
+
+def report(name, func):
+    seconds = timeit.timeit(func, number=ITERATIONS)
+    print(f"{name:<40} {seconds / ITERATIONS * 1e6:8.2f} us/request")
+
+
+if __name__ == "__main__":
+    investor = make_investor()
+    business = make_business()
+
+    report("InvestorResponse default encoder", lambda: default_path(schemas.InvestorResponse, investor))
+    report("InvestorResponse model_dump_json", lambda: model_json_path(schemas.InvestorResponse, investor))
+    report("BusinessResponse default encoder", lambda: default_path(schemas.BusinessResponse, business))
+    report("BusinessResponse model_dump_json", lambda: model_json_path(schemas.BusinessResponse, business))
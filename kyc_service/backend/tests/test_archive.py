@@ -0,0 +1,173 @@
+import os
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app import migrate, models
+from app.archive import (
+    SegmentArchive, _pack, _unpack, archive_finalized_documents, load_archived_documents, purge_expired_documents,
+)
+
+
+def test_pack_unpack_round_trip():
+    documents = {
+        "id_document_front": b"front" * 1000,
+        "id_document_back": None,
+        "selfie_with_id": b"",
+        "extra": bytes(range(256)),
+    }
+    assert _unpack(_pack(documents)) == documents
+
+
+def test_put_get_round_trip(tmp_path):
+    archive = SegmentArchive(str(tmp_path))
+    first = archive.put("investors:1", {"a": b"one", "b": None})
+    second = archive.put("investors:2", {"a": b"two" * 500, "b": b"x"})
+
+    assert archive.get(first) == {"a": b"one", "b": None}
+    assert archive.get(second) == {"a": b"two" * 500, "b": b"x"}
+    assert [entry["key"] for entry in archive.read_index()] == ["investors:1", "investors:2"]
+
+
+def test_segment_rollover(tmp_path):
+    archive = SegmentArchive(str(tmp_path), segment_max_bytes=64)
+    pointers = [archive.put(f"investors:{i}", {"a": os.urandom(100)}) for i in range(3)]
+
+    segments = [pointer.split(":")[0] for pointer in pointers]
+    assert segments == ["segment-000001.seg", "segment-000002.seg", "segment-000003.seg"]
+    for pointer in pointers:
+        assert archive.get(pointer)["a"] is not None
+
+
+def test_purge_skips_active_segment(tmp_path):
+    archive = SegmentArchive(str(tmp_path))
+    pointer = archive.put("investors:1", {"a": b"still being written"})
+
+    assert archive.purge(datetime.utcnow() + timedelta(days=1)) == []
+    assert archive.get(pointer) == {"a": b"still being written"}
+
+
+def test_purge_removes_full_expired_segments(tmp_path):
+    archive = SegmentArchive(str(tmp_path), segment_max_bytes=64)
+    old = archive.put("investors:1", {"a": os.urandom(100)})
+    active = archive.put("businesses:7", {"a": b"small"})
+
+    purged = archive.purge(datetime.utcnow() + timedelta(days=1))
+
+    assert purged == ["investors:1"]
+    assert not os.path.exists(os.path.join(str(tmp_path), old.split(":")[0]))
+    assert archive.get(active) == {"a": b"small"}
+    assert [entry["key"] for entry in archive.read_index()] == ["businesses:7"]
+
+
+def test_purge_keeps_segments_within_retention(tmp_path):
+    archive = SegmentArchive(str(tmp_path), segment_max_bytes=64)
+    archive.put("investors:1", {"a": os.urandom(100)})
+    archive.put("investors:2", {"a": b"small"})
+
+    assert archive.purge(datetime.utcnow() - timedelta(days=1)) == []
+    assert len(archive.read_index()) == 2
+
+
+def test_segment_numbers_are_not_reused_after_purge(tmp_path):
+    archive = SegmentArchive(str(tmp_path), segment_max_bytes=64)
+    old = archive.put("investors:1", {"a": os.urandom(100)})
+    archive.purge(datetime.utcnow() + timedelta(days=1))
+    assert archive.read_index() == []
+
+    new = archive.put("investors:2", {"a": b"small"})
+
+    assert new.split(":")[0] == "segment-000002.seg"
+    assert new.split(":")[0] != old.split(":")[0]
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'kyc.db'}")
+    migrate.upgrade(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def make_investor(db, status, finalized_days_ago, front=b"front"):
+    user = models.User(email=f"{status}-{finalized_days_ago}-{front!r}@example.com", hashed_password="x",
+                       user_type="investor")
+    db.add(user)
+    db.flush()
+    investor = models.Investor(
+        user_id=user.id, first_name="Aigerim", last_name="Nurlanovna", date_of_birth=date(1990, 5, 17),
+        phone_number="+77011234567", address="Almaty", id_document_type="id_card", id_document_number="900517400123",
+        id_document_front=front, id_document_back=None, selfie_with_id=b"selfie", verification_status=status,
+        finalized_at=None if finalized_days_ago is None else datetime.utcnow() - timedelta(days=finalized_days_ago),
+    )
+    db.add(investor)
+    db.commit()
+    return investor
+
+
+def test_archive_finalized_documents_filters_and_clears(db, tmp_path):
+    archive = SegmentArchive(str(tmp_path / "archive"))
+    old_approved = make_investor(db, "approved", 60, front=b"old approved")
+    legacy_rejected = make_investor(db, "rejected", None, front=b"legacy")
+    recent = make_investor(db, "approved", 1)
+    pending = make_investor(db, "pending", 60)
+
+    assert archive_finalized_documents(db, archive, min_age_days=30) == 2
+
+    for row in (old_approved, legacy_rejected):
+        db.refresh(row)
+        assert row.documents_archive_pointer
+        assert (row.id_document_front, row.id_document_back, row.selfie_with_id) == (None, None, None)
+    assert load_archived_documents(archive, old_approved) == {
+        "id_document_front": b"old approved", "id_document_back": None, "selfie_with_id": b"selfie",
+    }
+    assert load_archived_documents(archive, legacy_rejected)["id_document_front"] == b"legacy"
+    for row in (recent, pending):
+        db.refresh(row)
+        assert row.documents_archive_pointer is None
+        assert row.id_document_front == b"front"
+
+
+def test_archive_finalized_documents_is_idempotent(db, tmp_path):
+    archive = SegmentArchive(str(tmp_path / "archive"))
+    make_investor(db, "approved", 60)
+
+    assert archive_finalized_documents(db, archive, min_age_days=30) == 1
+    assert archive_finalized_documents(db, archive, min_age_days=30) == 0
+    assert len(archive.read_index()) == 1
+
+
+def test_purge_expired_documents_marks_rows(db, tmp_path):
+    archive = SegmentArchive(str(tmp_path / "archive"), segment_max_bytes=1)
+    first = make_investor(db, "approved", 60, front=os.urandom(100))
+    second = make_investor(db, "rejected", 60, front=os.urandom(100))
+    archive_finalized_documents(db, archive, min_age_days=30)
+    # every record fills its segment, so no segment is still being written to
+    assert purge_expired_documents(db, archive, retention_days=-1) == 2
+
+    for row in (first, second):
+        db.refresh(row)
+        assert row.documents_archive_pointer == "purged"
+        with pytest.raises(LookupError):
+            load_archived_documents(archive, row)
+    assert archive.read_index() == []
+    assert not [name for name in os.listdir(archive.root) if name.endswith(".seg")]
+
+
+def test_purge_keeps_files_when_commit_fails(db, tmp_path, monkeypatch):
+    archive = SegmentArchive(str(tmp_path / "archive"), segment_max_bytes=1)
+    investor = make_investor(db, "approved", 60, front=os.urandom(100))
+    archive_finalized_documents(db, archive, min_age_days=30)
+    pointer = investor.documents_archive_pointer
+
+    def fail():
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(db, "commit", fail)
+    with pytest.raises(RuntimeError):
+        purge_expired_documents(db, archive, retention_days=-1)
+
+    assert archive.get(pointer)["id_document_front"] is not None
+    assert len(archive.read_index()) == 1
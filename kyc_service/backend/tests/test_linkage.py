@@ -0,0 +1,161 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app import linkage, migrate, models
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    models.ApplicantLink.__table__.create(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def add_links(db, *links):
+    db.add_all(
+        models.ApplicantLink(key_type=key_type, key_value=value, applicant_type=applicant_type, applicant_id=applicant_id)
+        for key_type, value, applicant_type, applicant_id in links
+    )
+    db.commit()
+
+
+def test_clusters_union_across_key_types(db):
+    add_links(
+        db,
+        ("phone", "77011234567", "investor", 1),
+        ("phone", "77011234567", "business", 5),
+        ("id_number", "900517400123", "business", 5),
+        ("id_number", "900517400123", "investor", 2),
+        ("address", "almaty abay 10", "investor", 3),
+    )
+
+    clusters = linkage.find_clusters(db)
+
+    assert clusters == [{
+        "applicants": [("business", 5), ("investor", 1), ("investor", 2)],
+        "shared_keys": ["id_number", "phone"],
+    }]
+
+
+def test_clusters_skip_keys_above_fanout(db):
+    add_links(db, *[("address", "business centre", "investor", i) for i in range(1, 5)])
+    add_links(db, ("tax_number", "150340012345", "investor", 1), ("tax_number", "150340012345", "investor", 2))
+
+    clusters = linkage.find_clusters(db, max_key_fanout=3)
+
+    assert clusters == [{"applicants": [("investor", 1), ("investor", 2)], "shared_keys": ["tax_number"]}]
+
+
+
+@pytest.fixture
+def app_db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'kyc.db'}")
+    migrate.upgrade(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def make_investor(db, phone="+77011234567", id_number="900517400123", address="Almaty, Abay ave. 10", **fields):
+    user = models.User(email=f"{id_number}-{phone}@example.com", hashed_password="x", user_type="investor")
+    db.add(user)
+    db.flush()
+    values = dict(
+        first_name="Aigerim", last_name="Nurlanovna", date_of_birth=date(1990, 5, 17),
+        id_document_type="id_card", tax_number=None,
+    )
+    values.update(fields)
+    investor = models.Investor(
+        user_id=user.id, phone_number=phone, id_document_number=id_number, address=address, **values
+    )
+    db.add(investor)
+    db.flush()
+    return investor
+
+
+def make_business(db, phone="+77017654321", director_id_number="821102300456", **fields):
+    user = models.User(email=f"{director_id_number}-{phone}@example.com", hashed_password="x", user_type="business")
+    db.add(user)
+    db.flush()
+    values = dict(
+        company_name="Steppe Trading LLP", registration_number="1234567890", registration_date=date(2015, 3, 1),
+        tax_number="150340012345", legal_address="Astana, Mangilik El 55", physical_address="Astana, Mangilik El 55",
+        business_type="LLP", industry="retail", director_first_name="Daulet", director_last_name="Serikov",
+        director_dob=date(1982, 11, 2), email="info@example.kz",
+    )
+    values.update(fields)
+    business = models.Business(user_id=user.id, phone_number=phone, director_id_number=director_id_number, **values)
+    db.add(business)
+    db.flush()
+    return business
+
+
+def test_normalizers():
+    assert linkage.normalize_phone("8 701 123 45 67") == linkage.normalize_phone("+7 (701) 123-45-67") == "77011234567"
+    assert linkage.normalize_identifier("9005-1740 0123") == "900517400123"
+    assert linkage.normalize_text("  Алматы, Әл-Фараби пр.  77/8 ") == "алматы әл фараби пр 77 8"
+    assert linkage.person_key("AIGERIM", "Nurlanovna", date(1990, 5, 17)) == "aigerim nurlanovna|1990-05-17"
+    assert linkage.person_key("Aigerim", "Nurlanovna", None) is None
+
+
+def test_index_applicant_replaces_existing_entries(app_db):
+    investor = make_investor(app_db)
+    linkage.index_applicant(app_db, investor)
+    investor.phone_number = "+77770000000"
+    linkage.index_applicant(app_db, investor)
+    app_db.commit()
+
+    phones = [
+        link.key_value for link in app_db.query(models.ApplicantLink).filter_by(applicant_id=investor.id, key_type="phone")
+    ]
+    assert phones == ["77770000000"]
+
+
+def test_find_linked_applicants_across_investor_and_director(app_db):
+    investor = make_investor(app_db, phone="87011234567")
+    director = make_business(
+        app_db, phone="+77011234567", director_id_number="900517400123",
+        director_first_name="Aigerim", director_last_name="Nurlanovna", director_dob=date(1990, 5, 17),
+    )
+    unrelated = make_investor(app_db, phone="+77779999999", id_number="111111111111", address="Shymkent",
+                              first_name="Bolat", date_of_birth=date(1975, 1, 1))
+    for applicant in (investor, director, unrelated):
+        linkage.index_applicant(app_db, applicant)
+    app_db.commit()
+
+    assert linkage.find_linked_applicants(app_db, linkage.INVESTOR, investor.id) == {
+        (linkage.BUSINESS, director.id): ["id_number", "person", "phone"],
+    }
+
+
+def test_find_linked_applicants_skips_keys_above_fanout(app_db):
+    applicants = [
+        make_investor(app_db, phone=f"+7701000000{i}", id_number=f"90051740012{i}", address="Business centre")
+        for i in range(4)
+    ]
+    applicants.append(make_investor(app_db, phone="+77010000000", id_number="555555555555", address="Elsewhere"))
+    for applicant in applicants:
+        linkage.index_applicant(app_db, applicant)
+    app_db.commit()
+
+    linked = linkage.find_linked_applicants(app_db, linkage.INVESTOR, applicants[0].id, max_key_fanout=2)
+
+    assert linked == {(linkage.INVESTOR, applicants[4].id): ["phone"]}
+
+
+def test_rebuild_index_covers_existing_rows(app_db):
+    investor = make_investor(app_db)
+    business = make_business(app_db, phone="+77011234567")
+    investor_id, business_id = investor.id, business.id
+    app_db.add(models.ApplicantLink(key_type="phone", key_value="stale", applicant_type="investor", applicant_id=999))
+    app_db.commit()
+
+    assert linkage.rebuild_index(app_db) == 2
+
+    assert app_db.query(models.ApplicantLink).filter_by(key_value="stale").count() == 0
+    assert linkage.find_linked_applicants(app_db, linkage.INVESTOR, investor_id) == {
+        (linkage.BUSINESS, business_id): ["phone"],
+    }
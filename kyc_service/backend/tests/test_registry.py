@@ -0,0 +1,120 @@
+import sqlite3
+import time
+
+import pytest
+
+from app.registry import BUSINESSES, PERSONS, BloomFilter, RegistryMirror, normalize_dob
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "mirror.sqlite3")
+
+
+def businesses(start, stop, status="active"):
+    return [{"bin": f"{i:012d}", "name": f"Company {i}", "status": status} for i in range(start, stop)]
+
+
+def test_bloom_has_no_false_negatives():
+    bloom = BloomFilter.for_capacity(5000)
+    keys = [f"{i:012d}" for i in range(5000)]
+    for key in keys:
+        bloom.add(key)
+
+    assert all(key in bloom for key in keys)
+    false_positives = sum(f"x{i}" in bloom for i in range(10000))
+    assert false_positives < 300
+
+
+def test_bloom_survives_reload(path):
+    RegistryMirror(path).import_rows(BUSINESSES, businesses(0, 2000))
+
+    reopened = RegistryMirror(path)
+
+    assert all(f"{i:012d}" in reopened._blooms[BUSINESSES] for i in range(2000))
+    assert reopened.lookup_business("000000001999") == {"name": "Company 1999", "status": "active"}
+    assert reopened.lookup_business("000000002000") is None
+
+
+def test_full_import_replaces_table(path):
+    mirror = RegistryMirror(path)
+    mirror.import_rows(BUSINESSES, businesses(0, 10))
+    mirror.import_rows(BUSINESSES, businesses(5, 15))
+
+    assert mirror.lookup_business("000000000001") is None
+    assert mirror.lookup_business("000000000014") is not None
+
+
+def test_delta_import_upserts(path):
+    mirror = RegistryMirror(path)
+    mirror.import_rows(BUSINESSES, businesses(0, 10))
+    mirror.import_rows(BUSINESSES, businesses(5, 15, status="liquidated"), delta=True)
+
+    assert mirror.lookup_business("000000000001") == {"name": "Company 1", "status": "active"}
+    assert mirror.lookup_business("000000000007") == {"name": "Company 7", "status": "liquidated"}
+    assert mirror.lookup_business("000000000014") is not None
+
+
+def test_running_mirror_sees_delta_from_another_connection(path):
+    serving = RegistryMirror(path)
+    serving.import_rows(BUSINESSES, businesses(0, 10))
+    assert serving.lookup_business("000000000042") is None
+
+    RegistryMirror(path).import_rows(BUSINESSES, businesses(42, 43), delta=True)
+
+    assert serving.lookup_business("000000000042") == {"name": "Company 42", "status": "active"}
+
+
+def test_import_normalizes_keys_and_dates(path):
+    mirror = RegistryMirror(path)
+    mirror.import_rows(BUSINESSES, [{"bin": "1503-4001-2345", "name": "Steppe LLP", "status": "active"}])
+    mirror.import_rows(PERSONS, [{"iin": "900517 400123", "full_name": "Aigerim N", "dob": "17.05.1990", "status": "active"}])
+
+    assert mirror.lookup_business("150340012345") is not None
+    assert mirror.lookup_business("1503-4001-2345") is not None
+    assert mirror.lookup_person("900517400123")["dob"] == "1990-05-17"
+
+
+def test_import_skips_invalid_rows(path):
+    mirror = RegistryMirror(path)
+    rows = [
+        {"iin": "", "full_name": "No Key", "dob": "1990-01-01", "status": "active"},
+        {"iin": "900517400123", "full_name": "Bad Date", "dob": "May 1990", "status": "active"},
+        {"iin": "850101300456", "full_name": "", "dob": "1985-01-01", "status": "active"},
+        {"iin": "820211300789", "full_name": "Valid", "dob": "1982-02-11", "status": "active"},
+    ]
+
+    assert mirror.import_rows(PERSONS, rows) == 1
+    assert mirror.lookup_person("820211300789") == {"full_name": "Valid", "dob": "1982-02-11", "status": "active"}
+
+
+def test_normalize_dob_formats():
+    assert normalize_dob("1990-05-17") == "1990-05-17"
+    assert normalize_dob("17/05/1990") == "1990-05-17"
+    assert normalize_dob("") is None
+    with pytest.raises(ValueError):
+        normalize_dob("1990.17.05")
+
+
+def test_lookup_while_import_transaction_is_open(path):
+    serving = RegistryMirror(path)
+    serving.import_rows(BUSINESSES, businesses(0, 10))
+
+    writer = sqlite3.connect(path)
+    writer.execute("BEGIN EXCLUSIVE")
+    writer.execute("DELETE FROM businesses")
+    try:
+        started = time.perf_counter()
+        assert serving.lookup_business("000000000003") == {"name": "Company 3", "status": "active"}
+        assert time.perf_counter() - started < 0.1
+    finally:
+        writer.rollback()
+        writer.close()
+
+
+def test_lookup_error_is_a_miss(path):
+    serving = RegistryMirror(path)
+    serving.import_rows(BUSINESSES, businesses(0, 10))
+    serving.connection.close()
+
+    assert serving.lookup_business("000000000003") is None
@@ -0,0 +1,89 @@
+import re
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import static
+
+
+STYLES = "body { color: #222; }\n" * 200
+SCRIPT = "console.log('kyc');\n" * 200
+PAGE = '<html><head><link rel="stylesheet" href="styles.css"></head><body>{}<script src="script.js"></script></body></html>'
+
+
+@pytest.fixture
+def client(tmp_path):
+    (tmp_path / "styles.css").write_text(STYLES)
+    (tmp_path / "script.js").write_text(SCRIPT)
+    (tmp_path / "index.html").write_text(PAGE.format("<p>index</p>" * 200))
+    static.load_frontend(str(tmp_path))
+    app = FastAPI()
+    app.include_router(static.router)
+    yield TestClient(app)
+    static._bundle = None
+
+
+def hashed_asset(client, original):
+    stem, ext = original.split(".")
+    html = client.get("/", headers={"Accept-Encoding": "identity"}).text
+    match = re.search(rf'"(/assets/{stem}\.[0-9a-f]{{10}}\.{ext})"', html)
+    assert match, html
+    return match.group(1)
+
+
+def test_pages_point_at_hashed_assets(client):
+    html = client.get("/", headers={"Accept-Encoding": "identity"}).text
+    assert 'href="styles.css"' not in html
+    assert 'src="script.js"' not in html
+
+    response = client.get(hashed_asset(client, "script.js"), headers={"Accept-Encoding": "identity"})
+
+    assert response.status_code == 200
+    assert response.text == SCRIPT
+    assert response.headers["cache-control"] == static.IMMUTABLE_CACHE_CONTROL
+    assert client.get("/assets/script.js").status_code == 404
+
+
+@pytest.mark.skipif(static.brotli is None, reason="brotli is not installed")
+def test_brotli_preferred(client):
+    response = client.get(hashed_asset(client, "styles.css"), headers={"Accept-Encoding": "gzip, br"})
+
+    assert response.headers["content-encoding"] == "br"
+    assert response.text == STYLES
+
+
+def test_gzip_selected(client):
+    response = client.get(hashed_asset(client, "styles.css"), headers={"Accept-Encoding": "gzip, br;q=0"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.text == STYLES
+
+
+def test_identity_selected(client):
+    response = client.get(hashed_asset(client, "styles.css"), headers={"Accept-Encoding": "identity"})
+
+    assert "content-encoding" not in response.headers
+    assert response.text == STYLES
+
+
+def test_wildcard_accept_encoding(client):
+    path = hashed_asset(client, "styles.css")
+
+    assert client.get(path, headers={"Accept-Encoding": "*"}).headers["content-encoding"] in ("br", "gzip")
+    response = client.get(path, headers={"Accept-Encoding": "*;q=0, gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+
+
+def test_if_none_match_returns_304(client):
+    first = client.get("/", headers={"Accept-Encoding": "gzip"})
+    etag = first.headers["etag"]
+
+    response = client.get("/", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+    changed = client.get("/", headers={"Accept-Encoding": "gzip", "If-None-Match": '"stale"'})
+    assert changed.status_code == 200
@@ -0,0 +1,67 @@
+from datetime import date
+
+import pytest
+
+from app import verification
+from app.registry import BUSINESSES, PERSONS, RegistryMirror
+
+
+@pytest.fixture
+def mirror(tmp_path, monkeypatch):
+    mirror = RegistryMirror(str(tmp_path / "mirror.sqlite3"))
+    mirror.import_rows(PERSONS, [
+        {"iin": "900517400123", "full_name": "Nurlanovna Aigerim Serikkyzy", "dob": "17.05.1990", "status": "active"},
+        {"iin": "850101300456", "full_name": "Daulet Serikov", "dob": "1985-01-01", "status": "deceased"},
+    ])
+    mirror.import_rows(BUSINESSES, [{"bin": "150340012345", "name": "ТОО Steppe Trading", "status": "active"}])
+    monkeypatch.setattr(verification, "get_mirror", lambda: mirror)
+    return mirror
+
+
+@pytest.fixture
+def live_calls(monkeypatch):
+    calls = []
+
+    def live(*args):
+        calls.append(args)
+        return {"status": "verified", "confidence": "high", "source": "live"}
+
+    monkeypatch.setattr(verification, "_live_verify_identity", live)
+    monkeypatch.setattr(verification, "_live_verify_business", live)
+    return calls
+
+
+def test_identity_matches_regardless_of_word_order_and_patronymic(mirror, live_calls):
+    result = verification.verify_identity_with_government_db("900517400123", "Aigerim Nurlanovna", date(1990, 5, 17))
+
+    assert result["status"] == "verified"
+    assert result["source"] == "mirror"
+    assert live_calls == []
+
+
+def test_identity_name_mismatch_falls_back_to_live(mirror, live_calls):
+    result = verification.verify_identity_with_government_db("900517400123", "Aigerim Nurlanova", date(1990, 5, 17))
+
+    assert result["source"] == "live"
+    assert len(live_calls) == 1
+
+
+def test_identity_inactive_status_is_rejected(mirror, live_calls):
+    result = verification.verify_identity_with_government_db("850101300456", "Daulet Serikov", date(1985, 1, 1))
+
+    assert result["status"] == "not_verified"
+    assert live_calls == []
+
+
+def test_business_matches_without_legal_form_prefix(mirror, live_calls):
+    result = verification.verify_business_with_government_db("1503-4001-2345", "Steppe Trading")
+
+    assert result == {"status": "verified", "confidence": "high", "source": "mirror"}
+
+
+def test_mirror_error_falls_back_to_live(mirror, live_calls):
+    mirror.connection.close()
+
+    result = verification.verify_business_with_government_db("150340012345", "Steppe Trading")
+
+    assert result["source"] == "live"
@@ -30,7 +30,7 @@ document.getElementById('investor-form').addEventListener('submit', async functi
     
     try {
         // First register the user
-        const userResponse = await fetch('http://localhost:8000/register', {
+        const userResponse = await fetch('/register', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
@@ -64,7 +64,7 @@ document.getElementById('investor-form').addEventListener('submit', async functi
         formData.append('id_document_back', document.getElementById('investor-id-back').files[0]);
         formData.append('selfie_with_id', document.getElementById('investor-selfie').files[0]);
         
-        const investorResponse = await fetch('http://localhost:8000/register/investor', {
+        const investorResponse = await fetch('/register/investor', {
             method: 'POST',
             body: formData
         });
@@ -98,7 +98,7 @@ document.getElementById('business-form').addEventListener('submit', async functi
     
     try {
         // First register the user
-        const userResponse = await fetch('http://localhost:8000/register', {
+        const userResponse = await fetch('/register', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
@@ -141,7 +141,7 @@ document.getElementById('business-form').addEventListener('submit', async functi
         formData.append('company_registration_certificate', document.getElementById('registration-certificate').files[0]);
         formData.append('tax_registration_certificate', document.getElementById('tax-certificate').files[0]);
         
-        const businessResponse = await fetch('http://localhost:8000/register/business', {
+        const businessResponse = await fetch('/register/business', {
             method: 'POST',
             body: formData
         });